@@ -0,0 +1,150 @@
+"""
+Minimal HS256 JWT verification for the bearer auth service.
+Verifies tokens with OpenSSL-backed HMAC-SHA256 and parses claims with orjson,
+avoiding the pure-Python overhead of PyJWT on every authenticated request.
+"""
+import base64
+import binascii
+import functools
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+# Verified tokens, keyed by a keyed BLAKE2b hash of the token -> (exp, payload)
+_CACHE_MAX_SIZE = 4096
+_CACHE: 'OrderedDict[bytes, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+# Encoded headers of the HS256 tokens we issue (either key order); these skip
+# header JSON parsing entirely
+_HS256_HEADERS = frozenset((
+    b'eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9',  # {"alg":"HS256","typ":"JWT"}
+    b'eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9',  # {"typ":"JWT","alg":"HS256"}
+))
+
+
+class InvalidTokenError(Exception):
+    """Raised when a token is malformed or its signature does not verify."""
+
+
+class ExpiredSignatureError(InvalidTokenError):
+    """Raised when a token's signature is valid but its 'exp' claim has passed."""
+
+
+def _b64decode(segment: bytes) -> bytes:
+    """Decode an unpadded base64url JWT segment."""
+    return base64.urlsafe_b64decode(segment + b'=' * (-len(segment) % 4))
+
+
+@functools.lru_cache(maxsize=8)
+def _hmac_pads(key: bytes) -> 'Tuple[hashlib._Hash, hashlib._Hash]':
+    """Return SHA-256 contexts pre-fed with the HMAC inner and outer padded key."""
+    if len(key) > 64:
+        key = hashlib.sha256(key).digest()
+    key = key.ljust(64, b'\0')
+    inner = hashlib.sha256(bytes(b ^ 0x36 for b in key))
+    outer = hashlib.sha256(bytes(b ^ 0x5c for b in key))
+    return inner, outer
+
+
+def _hmac_sha256(key: bytes, msg: bytes) -> bytes:
+    """HMAC-SHA256 that resumes from cached key-pad states instead of rehashing the key."""
+    inner_pad, outer_pad = _hmac_pads(key)
+    inner = inner_pad.copy()
+    inner.update(msg)
+    outer = outer_pad.copy()
+    outer.update(inner.digest())
+    return outer.digest()
+
+
+def verify_hs256(token: bytes, key: bytes) -> Dict[str, Any]:
+    """Verify an HS256 JWT and return its payload.
+
+    Tokens that verified before and have not expired are served from an LRU
+    cache. Raises InvalidTokenError (or ExpiredSignatureError) if verification
+    fails.
+    """
+    # Keying the hash with the secret keeps entries from different secrets apart
+    # and stops clients from crafting colliding cache keys.
+    cache_key = hashlib.blake2b(token, digest_size=16, key=key[:64]).digest()
+    with _cache_lock:
+        entry = _CACHE.get(cache_key)
+        if entry is not None:
+            _CACHE.move_to_end(cache_key)
+    if entry is not None and entry[0] > time.time():
+        return entry[1]
+
+    payload = _verify(token, key)
+
+    exp = payload.get('exp')
+    expires = float('inf') if exp is None else float(int(exp))
+    with _cache_lock:
+        _CACHE[cache_key] = (expires, payload)
+        if len(_CACHE) > _CACHE_MAX_SIZE:
+            _CACHE.popitem(last=False)
+    return payload
+
+
+def _verify(token: bytes, key: bytes) -> Dict[str, Any]:
+    """Fully verify an HS256 JWT and return its payload."""
+    signing_input, _, signature_b64 = token.rpartition(b'.')
+    header_b64, _, payload_b64 = signing_input.partition(b'.')
+    if not header_b64 or not payload_b64 or b'.' in payload_b64:
+        raise InvalidTokenError('Not enough segments')
+
+    if header_b64 not in _HS256_HEADERS:
+        try:
+            header = orjson.loads(_b64decode(header_b64))
+        except (binascii.Error, orjson.JSONDecodeError):
+            raise InvalidTokenError('Invalid header encoding') from None
+        if not isinstance(header, dict) or header.get('alg') != 'HS256':
+            raise InvalidTokenError('The specified alg value is not allowed')
+
+    try:
+        signature = _b64decode(signature_b64)
+    except binascii.Error:
+        raise InvalidTokenError('Invalid signature encoding') from None
+
+    expected = _hmac_sha256(key, signing_input)
+    if not hmac.compare_digest(expected, signature):
+        raise InvalidTokenError('Signature verification failed')
+
+    # Only parse claims once the signature is known to be good
+    try:
+        payload = orjson.loads(_b64decode(payload_b64))
+    except (binascii.Error, orjson.JSONDecodeError):
+        raise InvalidTokenError('Invalid payload encoding') from None
+
+    if not isinstance(payload, dict):
+        raise InvalidTokenError('Invalid payload')
+
+    # Same checks PyJWT applies for HS256 with no audience configured
+    now = time.time()
+    exp = _time_claim(payload, 'exp', 'Expiration Time claim (exp) must be a number')
+    if exp is not None and exp <= now:
+        raise ExpiredSignatureError('Signature has expired')
+    nbf = _time_claim(payload, 'nbf', 'Not Before claim (nbf) must be a number')
+    if nbf is not None and nbf > now:
+        raise InvalidTokenError('The token is not yet valid (nbf)')
+    iat = _time_claim(payload, 'iat', 'Issued At claim (iat) must be a number')
+    if iat is not None and iat > now:
+        raise InvalidTokenError('The token is not yet valid (iat)')
+    if payload.get('aud'):
+        raise InvalidTokenError('Invalid audience')
+
+    return payload
+
+
+def _time_claim(payload: Dict[str, Any], claim: str, message: str) -> Optional[int]:
+    """Return a time claim truncated to whole seconds, as PyJWT compares them."""
+    value = payload.get(claim)
+    if value is None:
+        return None
+    if not isinstance(value, (int, float)):
+        raise InvalidTokenError(message)
+    return int(value)
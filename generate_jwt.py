@@ -9,10 +9,22 @@ Example:
     python3 generate_jwt.py --secret my-secret-key --days 365
 """
 
-import jwt
+import hmac
+import time
+import base64
 import secrets
 import argparse
-from datetime import datetime, timedelta, timezone
+
+import orjson
+
+
+def _b64encode(data: bytes) -> bytes:
+    """Base64url-encode data without padding, as JWT segments require."""
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+# Encoded JWT header shared by every HS256 token
+HEADER_B64 = _b64encode(orjson.dumps({'alg': 'HS256', 'typ': 'JWT'}))
 
 
 def generate_jwt_token(secret_key: str, expiration_days: int = 365) -> str:
@@ -26,17 +38,18 @@ def generate_jwt_token(secret_key: str, expiration_days: int = 365) -> str:
     Returns:
         JWT token string
     """
-    now = datetime.now(timezone.utc)
+    now = int(time.time())
     
     payload = {
         'sub': 'cloud-run-service',  # Subject
         'iat': now,  # Issued at
-        'exp': now + timedelta(days=expiration_days),  # Expiration
+        'exp': now + expiration_days * 86400,  # Expiration
         'iss': 'gcp-bearer-auth-service',  # Issuer
     }
     
-    token = jwt.encode(payload, secret_key, algorithm='HS256')
-    return token
+    signing_input = HEADER_B64 + b'.' + _b64encode(orjson.dumps(payload))
+    signature = hmac.digest(secret_key.encode(), signing_input, 'sha256')
+    return (signing_input + b'.' + _b64encode(signature)).decode('ascii')
 
 
 def main():
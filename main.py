@@ -4,84 +4,205 @@ Responds to authorized GET requests with a success message.
 Provides status information for all Cloud Run services in the project.
 Version: 1.0.2
 """
+import operator
 import os
-import jwt
-from datetime import datetime
-from flask import Flask, request, jsonify
-from google.cloud import run_v2
-from google.api_core import exceptions as google_exceptions
+import threading
+import time
+from datetime import datetime, timezone
+import orjson
+from flask import Flask, Response, request
+from werkzeug.exceptions import HTTPException
+
+import fast_jwt
 
 app = Flask(__name__)
 
 # Get the JWT secret key from environment variable
 JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'default-secret-key')
+JWT_SECRET_KEY_BYTES = JWT_SECRET_KEY.encode()
 
 # Get GCP project and region from environment
 GCP_PROJECT_ID = os.environ.get('GCP_PROJECT_ID', None)
 GCP_REGION = os.environ.get('GCP_REGION', 'us-central1')
 
+# Cloud Run API client, created on first use and shared across requests
+_services_client = None
+_services_client_lock = threading.Lock()
+_list_services_requests = {}
+
+
+def _get_services_client():
+    """Return the shared Cloud Run ServicesClient, creating it on first call."""
+    global _services_client
+    client = _services_client
+    if client is None:
+        with _services_client_lock:
+            client = _services_client
+            if client is None:
+                # Imported here so instances that never list services skip loading it
+                from google.cloud import run_v2
+                client = _services_client = run_v2.ServicesClient()
+    return client
+
+
+def _get_list_services_request(parent):
+    """Return a cached ListServicesRequest for the given parent."""
+    request_obj = _list_services_requests.get(parent)
+    if request_obj is None:
+        from google.cloud import run_v2
+        request_obj = _list_services_requests[parent] = run_v2.ListServicesRequest(parent=parent)
+    return request_obj
+
+
+# Resolves the core protobuf fields of a Service in one call
+_get_service_core = operator.attrgetter('name', 'uri', 'description', 'create_time', 'update_time', 'creator')
+
 
-def verify_jwt_token():
-    """Verify the JWT Bearer token from the Authorization header."""
-    auth_header = request.headers.get('Authorization')
+def _build_service_info(service):
+    """Build the JSON-ready description of a single Cloud Run service."""
+    name, uri, description, create_time, update_time, creator = _get_service_core(service)
+    # projects/<project>/locations/<region>/services/<service>
+    name_parts = name.split('/')
     
+    latest_revision = service.latest_ready_revision
+    
+    # Get condition status
+    conditions = service.conditions
+    ready_condition = next((c for c in conditions if c.type == 'Ready'), None) if conditions else None
+    
+    # Get ingress settings
+    ingress = service.ingress
+    
+    # Get traffic routing
+    traffic = service.traffic
+    traffic_info = None
+    if traffic:
+        traffic_info = []
+        for t in traffic:
+            traffic_type = t.type_
+            revision = t.revision
+            traffic_info.append({
+                'type': getattr(traffic_type, 'name', None) or str(traffic_type),
+                'percent': t.percent,
+                'revision': revision.rpartition('/')[2] if revision else None
+            })
+    
+    # Get scaling configuration
+    template = service.template
+    scaling = template.scaling if template else None
+    
+    # Every key is always present (None when absent) so each dict is built in
+    # one allocation with the same layout
+    return {
+        'name': name_parts[-1],
+        'url': uri,
+        'description': description or 'No description provided',
+        'created': create_time.isoformat() if create_time else None,
+        'updated': update_time.isoformat() if update_time else None,
+        'creator': creator or 'Unknown',
+        'region': name_parts[3],
+        'latest_revision': latest_revision.rpartition('/')[2] if latest_revision else None,
+        'health': ready_condition.state.name if ready_condition else None,
+        'health_message': (ready_condition.message or None) if ready_condition else None,
+        'ingress': ingress.name if ingress else None,
+        'traffic': traffic_info,
+        'scaling': {
+            'minInstances': scaling.min_instance_count,
+            'maxInstances': scaling.max_instance_count
+        } if scaling else None,
+    }
+
+
+# (epoch second, encoded ISO 8601 string) for the most recent health check timestamp
+_timestamp_cache = (0, b'')
+
+
+def _utc_timestamp():
+    """Return the current UTC time as encoded ISO 8601, cached per second."""
+    global _timestamp_cache
+    now = int(time.time())
+    cached_second, timestamp = _timestamp_cache
+    if now != cached_second:
+        timestamp = datetime.fromtimestamp(now, timezone.utc).isoformat().encode()
+        _timestamp_cache = (now, timestamp)
+    return timestamp
+
+
+def _timestamped_json_prefix(obj):
+    """Serialize obj with an open trailing 'timestamp' string member."""
+    return orjson.dumps(obj)[:-1] + b',"timestamp":"'
+
+
+# Pre-serialized bodies; health checks only splice in the cached timestamp
+_HEALTH_CHECK_PREFIX = _timestamped_json_prefix({
+    'status': 'healthy',
+    'service': 'gcp-bearer-auth-service',
+})
+_API_HEALTH_PREFIX = _timestamped_json_prefix({
+    'status': 'healthy',
+    'message': 'API is running',
+})
+_TIMESTAMP_SUFFIX = b'"}'
+_SECURE_RESPONSE_BODY = orjson.dumps({
+    'success': True,
+    'message': 'Request authorized successfully!',
+    'data': 'This is your secure response data.',
+    'version': '1.0.2'
+})
+
+
+def ojson(obj, status=200):
+    """Build a JSON response serialized with orjson."""
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
+
+
+def verify_jwt_token(auth_header):
+    """Verify the JWT Bearer token from an Authorization header value."""
     if not auth_header:
         return False, "Missing Authorization header"
     
-    if not auth_header.startswith('Bearer '):
+    scheme, sep, token = auth_header.partition(' ')
+    if scheme != 'Bearer' or not sep or not token:
         return False, "Invalid Authorization header format. Use: Bearer <token>"
     
-    token = auth_header.split(' ')[1]
-    
     if not token.startswith('eyJ'):
         return False, "Invalid JWT token format. JWT tokens must start with 'eyJ'"
     
     try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=['HS256'])
+        payload = fast_jwt.verify_hs256(token.encode(), JWT_SECRET_KEY_BYTES)
         return True, payload
-    except jwt.ExpiredSignatureError:
+    except fast_jwt.ExpiredSignatureError:
         return False, "Token has expired"
-    except jwt.InvalidTokenError as e:
+    except fast_jwt.InvalidTokenError as e:
         return False, f"Invalid token: {str(e)}"
 
 
 @app.route('/', methods=['GET'])
 def health_check():
     """Basic health check endpoint."""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'gcp-bearer-auth-service',
-        'timestamp': datetime.utcnow().isoformat()
-    })
+    body = _HEALTH_CHECK_PREFIX + _utc_timestamp() + _TIMESTAMP_SUFFIX
+    return Response(body, mimetype='application/json')
 
 
 @app.route('/api/health', methods=['GET'])
 def api_health():
     """API health check endpoint."""
-    return jsonify({
-        'status': 'healthy',
-        'message': 'API is running',
-        'timestamp': datetime.utcnow().isoformat()
-    })
+    body = _API_HEALTH_PREFIX + _utc_timestamp() + _TIMESTAMP_SUFFIX
+    return Response(body, mimetype='application/json')
 
 
 @app.route('/api/secure', methods=['GET'])
 def secure_endpoint():
     """Secured endpoint that requires JWT Bearer token authentication."""
-    is_valid, result = verify_jwt_token()
+    is_valid, result = verify_jwt_token(request.environ.get('HTTP_AUTHORIZATION'))
     
     if not is_valid:
-        return jsonify({
+        return ojson({
             'error': 'Unauthorized',
             'message': result
-        }), 401
+        }, status=401)
     
-    return jsonify({
-        'success': True,
-        'message': 'Request authorized successfully!',
-        'data': 'This is your secure response data.',
-        'version': '1.0.2'
-    })
+    return Response(_SECURE_RESPONSE_BODY, mimetype='application/json')
 
 
 @app.route('/api/services', methods=['GET'])
@@ -99,96 +220,85 @@ def list_services():
     - Scaling configuration
     """
     # Verify JWT token
-    is_valid, result = verify_jwt_token()
+    is_valid, result = verify_jwt_token(request.environ.get('HTTP_AUTHORIZATION'))
     if not is_valid:
-        return jsonify({
+        return ojson({
             'error': 'unauthorized',
             'message': result
-        }), 401
+        }, status=401)
     
     # Check if project ID is configured
     if not GCP_PROJECT_ID:
-        return jsonify({
+        return ojson({
             'error': 'configuration_error',
             'message': 'GCP_PROJECT_ID environment variable is not set'
-        }), 500
+        }, status=500)
+    
+    # Deferred like run_v2: google.api_core.exceptions loads grpc and the
+    # google.rpc protos, which health-check-only instances never need
+    from google.api_core.exceptions import GoogleAPICallError, NotFound, PermissionDenied
     
     try:
-        # Initialize Cloud Run client
-        client = run_v2.ServicesClient()
+        # Reuse the Cloud Run client and its gRPC channel across requests
+        client = _get_services_client()
         
         # List all services in the project
         parent = f"projects/{GCP_PROJECT_ID}/locations/-"
-        request_obj = run_v2.ListServicesRequest(parent=parent)
+        request_obj = _get_list_services_request(parent)
         
-        services = []
+        # The first page is fetched here, so API errors surface before streaming
         page_result = client.list_services(request=request_obj)
         
-        for service in page_result:
-            # Extract service information
-            service_info = {
-                'name': service.name.split('/')[-1],
-                'url': service.uri,
-                'description': service.description or 'No description provided',
-                'created': service.create_time.isoformat() if service.create_time else None,
-                'updated': service.update_time.isoformat() if service.update_time else None,
-                'creator': service.creator or 'Unknown',
-                'region': service.name.split('/')[3],
-            }
-            
-            # Get latest revision info
-            if service.latest_ready_revision:
-                service_info['latest_revision'] = service.latest_ready_revision.split('/')[-1]
-            
-            # Get condition status
-            if service.conditions:
-                ready_condition = next((c for c in service.conditions if c.type == 'Ready'), None)
-                if ready_condition:
-                    service_info['health'] = ready_condition.state.name
-                    if ready_condition.message:
-                        service_info['health_message'] = ready_condition.message
-            
-            # Get ingress settings
-            if service.ingress:
-                service_info['ingress'] = service.ingress.name
-            
-            # Get traffic routing
-            if service.traffic:
-                service_info['traffic'] = [
-                    {
-                        'type': t.type_.name if hasattr(t.type_, 'name') else str(t.type_),
-                        'percent': t.percent,
-                        'revision': t.revision.split('/')[-1] if t.revision else None
-                    }
-                    for t in service.traffic
-                ]
-            
-            # Get scaling configuration
-            if service.template and service.template.scaling:
-                service_info['scaling'] = {
-                    'minInstances': service.template.scaling.min_instance_count,
-                    'maxInstances': service.template.scaling.max_instance_count
+        def generate():
+            # Stream each service as its page arrives instead of buffering the list
+            yield b'{"status":"success","services":['
+            count = 0
+            try:
+                for service in page_result:
+                    service_json = orjson.dumps(_build_service_info(service))
+                    yield service_json if count == 0 else b',' + service_json
+                    count += 1
+            except Exception as e:
+                # The 200 status is already sent, so close the document with an
+                # error member rather than leaving the client truncated JSON
+                app.logger.exception('Failed to list services after %d results', count)
+                error = {
+                    'error': 'internal_error',
+                    'message': 'Failed to list all services; the list is incomplete'
                 }
-            
-            services.append(service_info)
+                if isinstance(e, GoogleAPICallError):
+                    error['details'] = str(e)
+                yield b'],"count":' + str(count).encode() + b',"error":' + orjson.dumps(error) + b'}'
+                return
+            yield b'],"count":' + str(count).encode() + b'}'
         
-        return jsonify({
-            'status': 'success',
-            'count': len(services),
-            'services': services
-        })
+        return Response(generate(), mimetype='application/json')
         
-    except google_exceptions.PermissionDenied as e:
-        return jsonify({
+    except PermissionDenied as e:
+        return ojson({
             'error': 'permission_denied',
             'message': 'Service account lacks permission to list Cloud Run services',
             'details': str(e)
-        }), 403
-    except Exception as e:
-        return jsonify({
-            'error': 'internal_error',
-            'message': f'Failed to list services: {str(e)}'
-        }), 500
+        }, status=403)
+    except NotFound as e:
+        return ojson({
+            'error': 'not_found',
+            'message': f'GCP project {GCP_PROJECT_ID} was not found',
+            'details': str(e)
+        }, status=404)
+
+
+@app.errorhandler(Exception)
+def handle_unexpected_error(e):
+    """Return unhandled errors as a JSON 500 response."""
+    # Let Flask render HTTP errors such as 404 and 405 as usual
+    if isinstance(e, HTTPException):
+        return e
+    app.logger.exception('Unhandled error while serving %s', request.path)
+    return ojson({
+        'error': 'internal_error',
+        'message': 'An internal error occurred'
+    }, status=500)
 
 
 if __name__ == '__main__':
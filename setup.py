@@ -0,0 +1,17 @@
+"""
+Compiles fast_jwt.py to a native extension with mypyc.
+
+Usage:
+    pip install -r requirements-build.txt
+    python setup.py build_ext --inplace
+
+The pure-Python fast_jwt.py keeps working when the extension is not built.
+"""
+from setuptools import setup
+from mypyc.build import mypycify
+
+setup(
+    name='gcp-bearer-auth-service',
+    py_modules=['fast_jwt'],
+    ext_modules=mypycify(['fast_jwt.py']),
+)
@@ -0,0 +1,184 @@
+"""Tests for fast_jwt against tokens encoded by PyJWT."""
+import base64
+import hmac
+import time
+
+import jwt
+import orjson
+import pytest
+
+import fast_jwt
+
+KEY = 'test-secret-key'
+KEY_BYTES = KEY.encode()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    fast_jwt._CACHE.clear()
+    yield
+    fast_jwt._CACHE.clear()
+
+
+def encode(payload, key=KEY, headers=None):
+    return jwt.encode(payload, key, algorithm='HS256', headers=headers).encode()
+
+
+def b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+def sign_raw(payload_json, header=b'{"alg":"HS256","typ":"JWT"}', key=KEY_BYTES):
+    """Sign an arbitrary payload byte string, which PyJWT cannot produce."""
+    signing_input = b64(header) + b'.' + b64(payload_json)
+    return signing_input + b'.' + b64(hmac.digest(key, signing_input, 'sha256'))
+
+
+def claims(**extra):
+    now = int(time.time())
+    return {'sub': 'cloud-run-service', 'iat': now, 'exp': now + 3600, **extra}
+
+
+def test_valid_token():
+    payload = claims()
+    token = encode(payload)
+    verified = fast_jwt.verify_hs256(token, KEY_BYTES)
+    assert verified == payload
+    # A cache hit returns the stored dict rather than parsing a new one
+    assert fast_jwt.verify_hs256(token, KEY_BYTES) is verified
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(fast_jwt, '_CACHE_MAX_SIZE', 2)
+    first, second, third = (encode(claims(jti=str(i))) for i in range(3))
+    verified_first = fast_jwt.verify_hs256(first, KEY_BYTES)
+    verified_second = fast_jwt.verify_hs256(second, KEY_BYTES)
+    fast_jwt.verify_hs256(first, KEY_BYTES)  # now the most recently used
+    fast_jwt.verify_hs256(third, KEY_BYTES)
+
+    assert len(fast_jwt._CACHE) == 2
+    assert fast_jwt.verify_hs256(first, KEY_BYTES) is verified_first
+    assert fast_jwt.verify_hs256(second, KEY_BYTES) is not verified_second
+
+
+def test_cached_token_expires(monkeypatch):
+    now = time.time()
+    token = encode(claims(exp=int(now) + 60))
+    fast_jwt.verify_hs256(token, KEY_BYTES)
+
+    # Once exp has passed the entry is ignored and full verification rejects it
+    monkeypatch.setattr(time, 'time', lambda: now + 120)
+    with pytest.raises(fast_jwt.ExpiredSignatureError):
+        fast_jwt.verify_hs256(token, KEY_BYTES)
+
+
+def test_token_without_exp():
+    fast_jwt.verify_hs256(encode({'sub': 'cloud-run-service'}), KEY_BYTES)
+
+
+def test_expired_token():
+    token = encode(claims(exp=int(time.time()) - 10))
+    with pytest.raises(fast_jwt.ExpiredSignatureError):
+        fast_jwt.verify_hs256(token, KEY_BYTES)
+
+
+def test_future_nbf():
+    token = encode(claims(nbf=int(time.time()) + 600))
+    with pytest.raises(fast_jwt.InvalidTokenError, match='nbf'):
+        fast_jwt.verify_hs256(token, KEY_BYTES)
+
+
+def test_past_nbf():
+    token = encode(claims(nbf=int(time.time()) - 5))
+    fast_jwt.verify_hs256(token, KEY_BYTES)
+    jwt.decode(token, KEY, algorithms=['HS256'])
+
+
+def test_future_iat():
+    token = encode(claims(iat=int(time.time()) + 600))
+    with pytest.raises(fast_jwt.InvalidTokenError, match='iat'):
+        fast_jwt.verify_hs256(token, KEY_BYTES)
+
+
+@pytest.mark.parametrize('claim', ['exp', 'nbf', 'iat'])
+def test_non_numeric_time_claim(claim):
+    token = encode(claims(**{claim: 'soon'}))
+    with pytest.raises(fast_jwt.InvalidTokenError, match=claim):
+        fast_jwt.verify_hs256(token, KEY_BYTES)
+
+
+def test_audience_rejected():
+    token = encode(claims(aud='some-service'))
+    with pytest.raises(fast_jwt.InvalidTokenError, match='Invalid audience'):
+        fast_jwt.verify_hs256(token, KEY_BYTES)
+
+
+def test_wrong_key():
+    token = encode(claims(), key='another-secret-key')
+    with pytest.raises(fast_jwt.InvalidTokenError, match='Signature verification failed'):
+        fast_jwt.verify_hs256(token, KEY_BYTES)
+
+
+def test_alg_none():
+    token = jwt.encode(claims(), None, algorithm='none').encode()
+    with pytest.raises(fast_jwt.InvalidTokenError):
+        fast_jwt.verify_hs256(token, KEY_BYTES)
+
+
+def test_alg_none_with_valid_hs256_signature():
+    token = sign_raw(orjson.dumps(claims()), header=b'{"alg":"none","typ":"JWT"}')
+    with pytest.raises(fast_jwt.InvalidTokenError, match='alg'):
+        fast_jwt.verify_hs256(token, KEY_BYTES)
+
+
+def test_non_canonical_header():
+    token = encode(claims(), headers={'kid': 'key-1'})
+    fast_jwt.verify_hs256(token, KEY_BYTES)
+
+
+@pytest.mark.parametrize('token_suffix', [b'.extra', b'.'])
+def test_extra_segments(token_suffix):
+    token = encode(claims()) + token_suffix
+    with pytest.raises(fast_jwt.InvalidTokenError):
+        fast_jwt.verify_hs256(token, KEY_BYTES)
+
+
+def test_missing_segments():
+    header, payload, _ = encode(claims()).split(b'.')
+    with pytest.raises(fast_jwt.InvalidTokenError, match='Not enough segments'):
+        fast_jwt.verify_hs256(header + b'.' + payload, KEY_BYTES)
+
+
+@pytest.mark.parametrize('segment', [0, 1, 2])
+def test_bad_base64(segment):
+    parts = encode(claims(), headers={'kid': 'key-1'}).split(b'.')
+    parts[segment] = b'a'  # a single base64 character can never decode
+    with pytest.raises(fast_jwt.InvalidTokenError):
+        fast_jwt.verify_hs256(b'.'.join(parts), KEY_BYTES)
+
+
+@pytest.mark.parametrize('payload_json', [b'not json at all', b'[1]', b'{}garbage', b'{"exp":1,}'])
+def test_malformed_signed_payload(payload_json):
+    with pytest.raises(fast_jwt.InvalidTokenError):
+        fast_jwt.verify_hs256(sign_raw(payload_json), KEY_BYTES)
+
+
+def test_escaped_exp_key():
+    with pytest.raises(fast_jwt.ExpiredSignatureError):
+        fast_jwt.verify_hs256(sign_raw(b'{"\\u0065xp":1}'), KEY_BYTES)
+
+
+def test_nested_exp_is_not_the_token_expiry():
+    fast_jwt.verify_hs256(sign_raw(b'{"ctx":{"exp":1},"sub":"a"}'), KEY_BYTES)
+
+
+def test_repeated_exp_uses_last_value():
+    # orjson, like PyJWT's json, keeps the last duplicate key
+    with pytest.raises(fast_jwt.ExpiredSignatureError):
+        fast_jwt.verify_hs256(sign_raw(b'{"exp":9999999999,"exp":1}'), KEY_BYTES)
+
+
+def test_hmac_matches_stdlib():
+    for size in (0, 1, 32, 64, 65, 200):
+        key = bytes(range(size))
+        assert fast_jwt._hmac_sha256(key, b'message') == hmac.digest(key, b'message', 'sha256')
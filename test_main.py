@@ -0,0 +1,87 @@
+"""Tests for /api/services against a fake Cloud Run client."""
+import time
+
+import jwt
+import orjson
+import pytest
+from google.api_core.exceptions import PermissionDenied, ServiceUnavailable
+from google.cloud import run_v2
+
+import main
+
+
+def service(name):
+    return run_v2.Service(
+        name=f'projects/test-project/locations/us-central1/services/{name}',
+        uri=f'https://{name}.a.run.app',
+    )
+
+
+class FakeServicesClient:
+    """Stands in for run_v2.ServicesClient with a canned pager."""
+
+    def __init__(self, services=(), error=None, first_page_error=None):
+        self.services = services
+        self.error = error
+        self.first_page_error = first_page_error
+
+    def list_services(self, request):
+        # The real pager fetches the first page before returning
+        if self.first_page_error is not None:
+            raise self.first_page_error
+        return self._pages()
+
+    def _pages(self):
+        yield from self.services
+        if self.error is not None:
+            raise self.error
+
+
+@pytest.fixture
+def get_services(monkeypatch):
+    monkeypatch.setattr(main, 'GCP_PROJECT_ID', 'test-project')
+    token = jwt.encode(
+        {'sub': 'test', 'exp': int(time.time()) + 3600}, main.JWT_SECRET_KEY, algorithm='HS256'
+    )
+
+    def get(**client_kwargs):
+        monkeypatch.setattr(main, '_services_client', FakeServicesClient(**client_kwargs))
+        return main.app.test_client().get(
+            '/api/services', headers={'Authorization': f'Bearer {token}'}
+        )
+
+    return get
+
+
+def test_streams_all_services(get_services):
+    response = get_services(services=[service('svc-1'), service('svc-2')])
+    assert response.status_code == 200
+    body = orjson.loads(response.data)
+    assert body['status'] == 'success'
+    assert body['count'] == 2
+    assert [s['url'] for s in body['services']] == [
+        'https://svc-1.a.run.app', 'https://svc-2.a.run.app'
+    ]
+    assert 'error' not in body
+
+
+def test_mid_stream_error_closes_document(get_services):
+    response = get_services(
+        services=[service('svc-1'), service('svc-2')],
+        error=ServiceUnavailable('backend unavailable'),
+    )
+    # The status was sent with the first chunk; the body must still parse
+    assert response.status_code == 200
+    body = orjson.loads(response.data)
+    assert body['count'] == 2
+    assert len(body['services']) == 2
+    assert body['error']['error'] == 'internal_error'
+    assert 'backend unavailable' in body['error']['details']
+
+
+def test_first_page_permission_denied(get_services):
+    response = get_services(first_page_error=PermissionDenied('caller lacks run.services.list'))
+    assert response.status_code == 403
+    body = orjson.loads(response.data)
+    assert body['error'] == 'permission_denied'
+    assert 'run.services.list' in body['details']